@@ -1,5 +1,5 @@
 # __init__.py
-from .validate import validate_node, validate_edge
+from .validate import validate_node, validate_edge, bulk_load
 from .models import (
     GenericNode,
     LinkNode,
@@ -1,5 +1,6 @@
 # encoder.py
 
+from enum import Enum
 from json import JSONEncoder
 
 from .models import (
@@ -19,26 +20,62 @@ from .models import (
 )
 
 
+def _encode_enum(obj):
+    return obj.value  # or however you want to represent NodeType
+
+
+def _encode_color(obj):
+    return obj.color  # Serialize Color instances as their color attribute
+
+
+def _encode_model(obj):
+    return obj.to_dict()  # Use the to_dict method to serialize these objects
+
+
+## exact type -> handler, so the common case is a single dict lookup rather than a chain of isinstance checks
+_ENCODERS = {
+    NodeType: _encode_enum,
+    GroupNodeBackgroundStyle: _encode_enum,
+    EdgesFromEndValue: _encode_enum,
+    EdgesFromSideValue: _encode_enum,
+    EdgesToEndValue: _encode_enum,
+    EdgesToSideValue: _encode_enum,
+    Color: _encode_color,
+    Edge: _encode_model,
+    GenericNode: _encode_model,
+    TextNode: _encode_model,
+    FileNode: _encode_model,
+    LinkNode: _encode_model,
+    GroupNode: _encode_model,
+}
+
+
+def _find_encoder(obj):
+    encode = _ENCODERS.get(type(obj))
+    if encode is not None:
+        return encode
+    # subclasses of the supported types (or any other Enum)
+    if isinstance(obj, Enum):
+        return _encode_enum
+    for base_type, encode in _ENCODERS.items():
+        if isinstance(obj, base_type):
+            return encode
+    return None
+
+
 class CustomEncoder(JSONEncoder):
     def default(self, obj):
-        if isinstance(
-            obj,
-            (
-                NodeType,
-                GroupNodeBackgroundStyle,
-                EdgesFromEndValue,
-                EdgesFromSideValue,
-                EdgesToEndValue,
-                EdgesToSideValue,
-            ),
-        ):
-            return obj.value  # or however you want to represent NodeType
-        if isinstance(obj, Color):
-            return obj.color  # Serialize Color instances as their color attribute
-        if isinstance(
-            obj, (Edge, GenericNode, TextNode, FileNode, LinkNode, GroupNode)
-        ):
-            return obj.to_dict()  # Use the to_dict method to serialize these objects
+        encode = _find_encoder(obj)
+        if encode is not None:
+            return encode(obj)
 
         # Call the base class implementation which takes care of raising exceptions for unsupported types
         return JSONEncoder.default(self, obj)
+
+
+def _encode_canvas_types(obj):
+    """`default` hook for orjson, mirroring CustomEncoder.default."""
+    encode = _find_encoder(obj)
+    if encode is not None:
+        return encode(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -1,7 +1,8 @@
 # jsoncanvas.py
-from copy import deepcopy
-from typing import Dict, List, Tuple, Set, Optional, Callable, Union, Any
-from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Tuple, Set, Optional, Callable, Union, Any
+from dataclasses import dataclass, field, fields, replace
+from operator import attrgetter, is_
+from sys import intern
 from .models import (
     Edge,
     NodeType,
@@ -23,54 +24,186 @@ from .exceptions import (
     EdgeNotFoundError,
     InvalidJsonError,
 )
-from json import dumps, loads, JSONDecodeError
-from .encoder import CustomEncoder
+from json import dumps, loads
+from .encoder import CustomEncoder, _encode_canvas_types
 
-from .validate import validate_node, validate_edge
+try:
+    import orjson  # optional C-accelerated (de)serializer
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson  # optional SIMD parser (pysimdjson), used for loading when orjson isn't installed
+except ImportError:
+    simdjson = None
+
+from .validate import validate_node, validate_edge, _skip_validation
+from . import utils
+
+
+## NodeType values bound once, so hot loops don't repeat the enum attribute lookups
+_TYPE_TEXT = NodeType.TEXT.value
+_TYPE_FILE = NodeType.FILE.value
+_TYPE_LINK = NodeType.LINK.value
+_TYPE_GROUP = NodeType.GROUP.value
+
+## node "type" string -> node class, used by Canvas.from_json
+_NODE_CLS = {
+    _TYPE_TEXT: TextNode,
+    _TYPE_FILE: FileNode,
+    _TYPE_LINK: LinkNode,
+    _TYPE_GROUP: GroupNode,
+}
+
+## node class -> names of its __init__ fields; keys outside these (e.g. extra keys written by other JSON Canvas apps) are dropped by Canvas.from_json
+_NODE_FIELDS = {
+    node_cls: frozenset(f.name for f in fields(node_cls) if f.init)
+    for node_cls in _NODE_CLS.values()
+}
+
+## enum-valued keys interned by Canvas.from_json: they only take a handful of distinct values, so the parsed strings collapse onto one shared object each
+_NODE_ENUM_KEYS = ("type", "backgroundStyle")
+_EDGE_ENUM_KEYS = ("fromSide", "fromEnd", "toSide", "toEnd")
+
+
+def _intern_values(item_dict: Dict[str, Any], keys: Tuple[str, ...]) -> None:
+    for key in keys:
+        value = item_dict.get(key)
+        if type(value) is str:
+            item_dict[key] = intern(value)
+
+
+## the concrete node classes accepted by Canvas.validate
+_NODE_TYPES = (TextNode, FileNode, LinkNode, GroupNode)
+
+
+## per-class getters returning the tuple of an item's dataclass field values, see `_item_json`
+_FIELD_VALUES_GETTERS: Dict[type, Callable[[Any], Tuple]] = {}
+
+
+def _dumps_bytes(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_encode_canvas_types)
+    return dumps(obj, cls=CustomEncoder).encode()
+
+
+def _item_json(item: Union[GenericNode, Edge]) -> bytes:
+    """ returns the serialized JSON of a node or edge, reusing the bytes cached on the item while its fields still hold the same objects.
+    """
+    item_cls = type(item)
+    get_field_values = _FIELD_VALUES_GETTERS.get(item_cls)
+    if get_field_values is None:
+        get_field_values = _FIELD_VALUES_GETTERS[item_cls] = attrgetter(*(f.name for f in fields(item_cls)))
+    field_values = get_field_values(item)
+    cached = getattr(item, "_json_cache", None)
+    ## compared element-wise by identity, not ==: `1 == 1.0 == True` would keep serving stale bytes after e.g. `node.x = 1.0`.
+    ## An equal value held in a new object is just a cache miss.
+    if cached is not None and all(map(is_, cached[0], field_values)):
+        return cached[1]
+    item_json = _dumps_bytes(item.to_dict())
+    item._json_cache = (field_values, item_json)
+    return item_json
 
 
 @dataclass
 class Canvas:
     nodes: List[GenericNode]
     edges: List[Edge]
+    ## id -> object indices, kept in sync by the add_*/remove_* methods (mutating `nodes`/`edges` directly bypasses them)
+    _node_by_id: Dict[str, GenericNode] = field(init=False, repr=False, compare=False)
+    _edge_by_id: Dict[str, Edge] = field(init=False, repr=False, compare=False)
+    ## adjacency lists: node id -> edges leaving (_out_adj) / entering (_in_adj) that node, in edge order
+    _out_adj: Dict[str, List[Edge]] = field(init=False, repr=False, compare=False)
+    _in_adj: Dict[str, List[Edge]] = field(init=False, repr=False, compare=False)
+    ## lazily built (nodes snapshot, (N, 4) array of their bounds) for `find_children` (requires numpy), dropped by add_node/remove_node. Node positions are fixed after construction (see GenericNode.x1).
+    _node_bounds: Optional[Tuple[Tuple[GenericNode, ...], Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    _simdjson_parser = None  # shared simdjson.Parser, reuses its internal buffers across loads
+
+    def __post_init__(self):
+        self._node_by_id = {node.id: node for node in self.nodes}
+        self._edge_by_id = {edge.id: edge for edge in self.edges}
+        self._out_adj = {}
+        self._in_adj = {}
+        for edge in self.edges:
+            self._index_edge(edge)
+
+    def _index_edge(self, edge: Edge) -> None:
+        self._out_adj.setdefault(edge.fromNode, []).append(edge)
+        self._in_adj.setdefault(edge.toNode, []).append(edge)
+
+    def _unindex_edge(self, edge: Edge) -> None:
+        for adj, node_id in ((self._out_adj, edge.fromNode), (self._in_adj, edge.toNode)):
+            try:
+                adj[node_id].remove(edge)
+            except (KeyError, ValueError):
+                pass
 
     def to_json(self) -> str:
-        return dumps(
-            {
-                "nodes": [node.to_dict() for node in self.nodes],
-                "edges": [edge.to_dict() for edge in self.edges],
-            },
-            cls=CustomEncoder,
-        )
+        ## joins the (cached) per-item fragments, matching the separators each backend would have produced for the whole document
+        sep, head, middle, tail = (b",", b'{"nodes":[', b'],"edges":[', b"]}") if orjson is not None else (b", ", b'{"nodes": [', b'], "edges": [', b"]}")
+        return b"".join((
+            head,
+            sep.join([_item_json(node) for node in self.nodes]),
+            middle,
+            sep.join([_item_json(edge) for edge in self.edges]),
+            tail,
+        )).decode()
 
-    @staticmethod
-    def from_json(json_str: str) -> "Canvas":
+    @classmethod
+    def _parse_json(cls, json_str: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """ parses json_str and returns the raw (node_dicts, edge_dicts), using the fastest available parser.
+
+        orjson is tried first: every node and edge is turned into a dict anyway, and doing that through simdjson's `as_dict()` makes the whole load slower than `orjson.loads`.
+        """
         try:
-            canvas_dict = loads(json_str)
-            nodes = []
-            edges = []
-            for node in canvas_dict["nodes"]:
-                # if node.type == NodeType.TEXT:
-                if node["type"] == NodeType.TEXT.value:
-                    nodes.append(TextNode(**node))
-                # elif node.type == NodeType.FILE:
-                elif node["type"] == NodeType.FILE.value:
-                    nodes.append(FileNode(**node))
-                # elif node.type == NodeType.LINK:
-                elif node["type"] == NodeType.LINK.value:
-                    nodes.append(LinkNode(**node))
-                # elif node.type == NodeType.GROUP:
-                elif node["type"] == NodeType.GROUP.value:
-                    nodes.append(GroupNode(**node))
-                else:
-                    raise InvalidNodeTypeError(
-                        f"Invalid or unsupported node type.The node {node['id']} has an invalid or unsupported type {node['type']}."
-                    )
-            for edge in canvas_dict["edges"]:
-                edges.append(Edge(**edge))
-            return Canvas(nodes=nodes, edges=edges)
-        except JSONDecodeError as e:
+            if orjson is not None:
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                canvas_dict = orjson.loads(json_str)
+            elif simdjson is not None:
+                if cls._simdjson_parser is None:
+                    cls._simdjson_parser = simdjson.Parser()
+                json_bytes = json_str.encode()
+                try:
+                    doc = cls._simdjson_parser.parse(json_bytes)
+                except RuntimeError:
+                    ## a document from a previous parse is still referenced somewhere, so the shared parser can't be reused
+                    doc = simdjson.Parser().parse(json_bytes)
+                ## materialize each element before the parser is reused; the document proxies are only valid until then
+                node_dicts = [node.as_dict() for node in doc["nodes"]]
+                edge_dicts = [edge.as_dict() for edge in doc["edges"]]
+                del doc
+                return node_dicts, edge_dicts
+            else:
+                canvas_dict = loads(json_str)
+        except ValueError as e:  # JSONDecodeError, or simdjson's parse error
             raise InvalidJsonError("Invalid or malformed JSON.") from e
+        return canvas_dict["nodes"], canvas_dict["edges"]
+
+    @staticmethod
+    def from_json(json_str: str) -> "Canvas":
+        node_dicts, edge_dicts = Canvas._parse_json(json_str)
+        nodes = []
+        for node in node_dicts:
+            _intern_values(node, _NODE_ENUM_KEYS)
+            node_cls = _NODE_CLS.get(node["type"])
+            if node_cls is None:
+                raise InvalidNodeTypeError(
+                    f"Invalid or unsupported node type.The node {node['id']} has an invalid or unsupported type {node['type']}."
+                )
+            node_fields = _NODE_FIELDS[node_cls]
+            if not (node.keys() <= node_fields):
+                node = {k: v for k, v in node.items() if k in node_fields}
+            nodes.append(node_cls(**node))
+        edges = []
+        for edge in edge_dicts:
+            _intern_values(edge, _EDGE_ENUM_KEYS)
+            edges.append(Edge._from_json_dict(edge))
+        ## validated in bulk, once every edge is built
+        if not _skip_validation.get():
+            for edge in edges:
+                validate_edge(edge)
+        return Canvas(nodes=nodes, edges=edges)
 
     def export(self, file_path: str) -> None:
         with open(file_path, "w") as f:
@@ -79,7 +212,7 @@ class Canvas:
     def validate(self) -> bool:
         try:
             if not all(
-                isinstance(node, (TextNode, FileNode, LinkNode, GroupNode))
+                isinstance(node, _NODE_TYPES)
                 and validate_node(node)
                 for node in self.nodes
             ):
@@ -88,56 +221,59 @@ class Canvas:
                 raise InvalidEdgeAttributeError(
                     "Invalid or missing edge attribute found."
                 )
+            node_ids = {node.id for node in self.nodes}
             for edge in self.edges:
                 validate_edge(edge)
-                if edge.fromNode not in [
-                    node.id for node in self.nodes
-                ] or edge.toNode not in [node.id for node in self.nodes]:
+                if edge.fromNode not in node_ids or edge.toNode not in node_ids:
                     raise OrphanEdgeError("Edge is orphan.")
             return True
         except (InvalidNodeTypeError, InvalidEdgeAttributeError, OrphanEdgeError) as e:
             raise CanvasValidationError("Canvas validation failed.") from e
 
     def get_node(self, node_id: str) -> GenericNode:
-        for node in self.nodes:
-            if node.id == node_id:
-                return node
-        else:
+        node = self._node_by_id.get(node_id)
+        if node is None:
             raise NodeNotFoundError("Node with id does not exist")
+        return node
 
-    def get_edge(self, edge_id: str) -> GenericNode:
-        for edge in self.edges:
-            if edge.id == edge_id:
-                return edge
-        else:
+    def get_edge(self, edge_id: str) -> Edge:
+        edge = self._edge_by_id.get(edge_id)
+        if edge is None:
             raise EdgeNotFoundError("Edge with id does not exist")
+        return edge
 
     def add_node(self, node: GenericNode) -> None:
         validate_node(node)
-        if node.id in [n.id for n in self.nodes]:
+        if node.id in self._node_by_id:
             raise NodeIDConflictError("Node with id already exists")
         self.nodes.append(node)
+        self._node_by_id[node.id] = node
+        self._node_bounds = None
 
     def add_edge(self, edge: Edge) -> None:
         validate_edge(edge)
-        if edge.id in [e.id for e in self.edges]:
+        if edge.id in self._edge_by_id:
             raise EdgeIDConflictError("Edge with id already exists")
         self.edges.append(edge)
+        self._edge_by_id[edge.id] = edge
+        self._index_edge(edge)
 
     def remove_node(self, node_id: str) -> bool:
-        node_exists = False
-        nodes = self.nodes
-        self.nodes = [node for node in self.nodes if node.id != node_id]
-        if len(self.nodes) != len(nodes):
-            node_exists = True
-        self.edges = [
-            edge
-            for edge in self.edges
-            if edge.fromNode != node_id and edge.toNode != node_id
-        ]
-        if not node_exists:
+        if node_id not in self._node_by_id:
             raise NodeNotFoundError(f"Node with id {node_id} does not exist.")
-        return node_exists
+        del self._node_by_id[node_id]
+        self._node_bounds = None
+        self.nodes = [node for node in self.nodes if node.id != node_id]
+        ## the node's edges come straight from its adjacency lists, only they need unindexing
+        removed_edges = self._out_adj.pop(node_id, []) + self._in_adj.pop(node_id, [])
+        if removed_edges:
+            removed_edge_ids = set()
+            for edge in removed_edges:
+                removed_edge_ids.add(edge.id)
+                self._edge_by_id.pop(edge.id, None)
+                self._unindex_edge(edge)
+            self.edges = [edge for edge in self.edges if edge.id not in removed_edge_ids]
+        return True
 
     def remove_edge(self, edge_id: str) -> None:
         edge_exists = False
@@ -145,14 +281,18 @@ class Canvas:
         self.edges = [edge for edge in self.edges if edge.id != edge_id]
         if len(self.edges) != len(edges):
             edge_exists = True
+            removed_edge = self._edge_by_id.pop(edge_id, None)
+            if removed_edge is not None:
+                self._unindex_edge(removed_edge)
         if not edge_exists:
             raise EdgeNotFoundError(f"Edge with id {edge_id} does not exist.")
 
     def get_connections(self, node_id: str) -> List[Edge]:
-        return [
+        ## self-loops are in both lists, only report them once
+        return self._out_adj.get(node_id, []) + [
             edge
-            for edge in self.edges
-            if edge.fromNode == node_id or edge.toNode == node_id
+            for edge in self._in_adj.get(node_id, [])
+            if edge.fromNode != node_id
         ]
 
     def get_edge_nodes(self, edge_id: str) -> Tuple[GenericNode, GenericNode]:
@@ -160,42 +300,59 @@ class Canvas:
         return [self.get_node(edge.fromNode), self.get_node(edge.toNode)]
 
     def get_adjacent_nodes(self, node_id: str) -> List[GenericNode]:
-        return [
-            self.get_node(edge.fromNode)
-            for edge in self.edges
-            if edge.toNode == node_id
-        ] + [
-            self.get_node(edge.toNode)
-            for edge in self.edges
-            if edge.fromNode == node_id
-        ]
+        get_node = self.get_node
+        adjacent_nodes = [get_node(edge.fromNode) for edge in self._in_adj.get(node_id, ())]
+        adjacent_nodes.extend(get_node(edge.toNode) for edge in self._out_adj.get(node_id, ()))
+        return adjacent_nodes
+
+
+    def find_children(self, group_node: GroupNode) -> List[GenericNode]:
+        """ returns the nodes of this canvas completely contained within group_node's bounds (see `GroupNode.find_children`).
+
+        With numpy installed the bounds of all nodes are kept in a single array, so each query is one vectorized comparison instead of a Python loop (a numba-compiled loop if `utils.USE_NUMBA` is set and numba is installed).
+        """
+        np = utils.get_numpy()
+        if np is None:
+            return group_node.find_children(self.nodes)
+        nodes = self.nodes
+        ## the array is reused only while self.nodes holds the very same node objects, in the same order (compared by identity: == compares node ids,
+        ## which `replace()` keeps), so it is also rebuilt after self.nodes was changed directly
+        cached = self._node_bounds
+        if cached is None or len(cached[0]) != len(nodes) or not all(map(is_, cached[0], nodes)):
+            cached = self._node_bounds = (tuple(nodes), utils.node_bounds_array(nodes))
+        mask = utils.contained_mask(cached[1], group_node.x, group_node.y, group_node.x1, group_node.y1)
+        return [nodes[i] for i in np.flatnonzero(mask) if nodes[i].id != group_node.id]
 
 
     @classmethod
     def find_group_node_with_label(cls, loaded_group_nodes: List[GroupNode], search_group_node_label: str) -> Optional[GroupNode]:
-        """ finds and returns the group node with the specified label
+        """ finds and returns (a shallow copy of) the first group node with the specified label, or None if there is no such node
         """
-        found_group_node = None
         for a_group_node in loaded_group_nodes:
-            if found_group_node is None: ## not yet found
-                if (a_group_node.label == search_group_node_label):
-                    ## found match
-                    found_group_node = deepcopy(a_group_node)
-
-
-        return found_group_node
+            if (a_group_node.label == search_group_node_label):
+                ## found match, copy the fields only, they are either immutable or shared `Color` values
+                return replace(a_group_node)
+        return None
 
 
     @classmethod
     def recurrsively_find_nested_groups(cls, a_group_node: GroupNode, remaining_canvas_nodes: Set[GenericNode]) -> Dict:
+        """ returns a dict mapping a_group_node to its children (from remaining_canvas_nodes), and each child group node to its own (recursively computed) dict of the same form.
+        """
+        return cls._find_nested_groups(a_group_node, remaining_canvas_nodes, {})
+
+    @classmethod
+    def _find_nested_groups(cls, a_group_node: GroupNode, remaining_canvas_nodes: Set[GenericNode], _memo: Dict[Tuple[str, FrozenSet[str]], Dict]) -> Dict:
         if len(remaining_canvas_nodes) == 0:
             return {}
-        else:
-            _out_dict = {}
-            found_children_nodes = a_group_node.find_children(remaining_canvas_nodes)
-            ## find group nodes
-            curr_found_subgroup_nodes: Set[GroupNode] = set([v for v in found_children_nodes if (v.type.value == NodeType.GROUP.value)])
-            _out_dict.update({v:cls.recurrsively_find_nested_groups(a_group_node=v, remaining_canvas_nodes=found_children_nodes) for v in found_children_nodes if (v.type.value == NodeType.GROUP.value)})
-
-            _out_dict[a_group_node] = found_group_children ## need to recurrsively search for group nodes and therefore children here
+        ## the same subgroup is reached once per enclosing group, only search it once per distinct set of candidates
+        memo_key = (a_group_node.id, frozenset(v.id for v in remaining_canvas_nodes))
+        _out_dict = _memo.get(memo_key)
+        if _out_dict is not None:
             return _out_dict
+        found_children_nodes = a_group_node.find_children(remaining_canvas_nodes)
+        ## find group nodes
+        _out_dict = {v:cls._find_nested_groups(a_group_node=v, remaining_canvas_nodes=found_children_nodes, _memo=_memo) for v in found_children_nodes if (v.type is NodeType.GROUP)}
+        _out_dict[a_group_node] = found_children_nodes
+        _memo[memo_key] = _out_dict
+        return _out_dict
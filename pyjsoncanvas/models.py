@@ -1,50 +1,87 @@
 # models.py
 import sys
-from dataclasses import field
+from dataclasses import dataclass, field, fields
+from functools import partial
 from typing import Any, Dict, List, Set, Tuple, Optional, Union
 
 # Check Python version
 PY_310_OR_HIGHER = sys.version_info >= (3, 10)
 
 # Use conditional dataclass decorator based on Python version
+# Classes are given __slots__ by default: instances skip the per-object __dict__ and attribute access is a fixed-offset read.
+# NOTE: the decorated class is re-created, so methods of slotted classes must call base methods explicitly (e.g. `GenericNode.__post_init__(self)`) rather than via zero-argument `super()`.
 if PY_310_OR_HIGHER:
-    def version_compatible_dataclass(*args, **kwargs):
-        from dataclasses import dataclass
-        return dataclass(*args, **kwargs)
+    # native kw_only/slots support: a plain partial, no wrapper function needed
+    version_compatible_dataclass = partial(dataclass, slots=True)
 else:
+    from dataclasses import MISSING, _HAS_DEFAULT_FACTORY
+
+    def _add_slots(cls):
+        """Re-create the dataclass `cls` with `__slots__` for its fields (what `dataclass(slots=True)` does on Python >= 3.10)"""
+
+        cls_dict = dict(cls.__dict__)
+        field_names = tuple(f.name for f in fields(cls))
+        inherited_slots = set()
+        for base in cls.__mro__[1:-1]:
+            inherited_slots.update(getattr(base, '__slots__', ()))
+        cls_dict['__slots__'] = tuple(name for name in field_names if name not in inherited_slots)
+        for name in field_names:
+            # remove the class-level defaults, they would conflict with the slot descriptors
+            cls_dict.pop(name, None)
+        cls_dict.pop('__dict__', None)
+        cls_dict.pop('__weakref__', None)
+        slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+        slotted_cls.__qualname__ = cls.__qualname__
+        return slotted_cls
+
+    def _make_kw_only_init(dc_cls):
+        """Generate an __init__ for the dataclass `dc_cls` taking its init fields as keyword-only arguments (extra keywords are ignored), forwarding them positionally to the dataclass-generated __init__"""
+
+        namespace = {'_orig_init': dc_cls.__init__}
+        params = []
+        args = []
+        for f in fields(dc_cls):
+            if not f.init:
+                continue
+            if f.default is not MISSING:
+                namespace[f'_dflt_{f.name}'] = f.default
+                params.append(f'{f.name}=_dflt_{f.name}')
+            elif f.default_factory is not MISSING:
+                # the dataclass __init__ calls the factory when it receives this sentinel
+                namespace[f'_dflt_{f.name}'] = _HAS_DEFAULT_FACTORY
+                params.append(f'{f.name}=_dflt_{f.name}')
+            else:
+                params.append(f.name)
+            args.append(f.name)
+        params.append('**_ignored_kwargs')
+        src = (
+            f"def __init__(self, {'*, ' if args else ''}{', '.join(params)}):\n"
+            f"    _orig_init(self, {', '.join(args)})\n"
+        )
+        exec(src, namespace)
+        __init__ = namespace['__init__']
+        __init__.__qualname__ = f'{dc_cls.__qualname__}.__init__'
+        return __init__
+
     def version_compatible_dataclass(*args, **kwargs):
         """Emulate kw_only behavior for Python < 3.10"""
-        from dataclasses import dataclass, _MISSING_TYPE
         
         # Store if kw_only was requested
         kw_only_requested = kwargs.pop('kw_only', False)
+        slots_requested = kwargs.pop('slots', True)
         
         # Define a class decorator that will process the class
         def wrap(cls):
             # Apply standard dataclass decorator first
             dc_cls = dataclass(**kwargs)(cls)
+            if slots_requested:
+                dc_cls = _add_slots(dc_cls)
             
             # If kw_only was requested, we need to modify the __init__ method
-            if kw_only_requested or True: ## always allow extra fields
-                # Get the original __init__ method
-                orig_init = dc_cls.__init__
-                
-                # Get the field names from the dataclass
-                field_names = set(f.name for f in dc_cls.__dataclass_fields__.values())
-                
-                # Create a new __init__ that emulates keyword-only arguments
+            if kw_only_requested:
+                # Replace it (once, at decoration time) with an __init__ that emulates keyword-only arguments
                 # and ignores extra keywords
-                def __init__(self, **kwargs):
-                    # Filter out kwargs that aren't fields in the dataclass
-                    filtered_kwargs = {k: v for k, v in kwargs.items() if k in field_names}
-                    # Call the original __init__ with filtered keyword arguments
-                    orig_init(self, **filtered_kwargs)
-                
-                # Replace the __init__ method
-                dc_cls.__init__ = __init__
-                
-                # Add a marker to indicate this class uses kw_only
-                setattr(dc_cls, '_kw_only', True)
+                dc_cls.__init__ = _make_kw_only_init(dc_cls)
             
             return dc_cls
         
@@ -56,14 +93,18 @@ else:
         return wrap
     
 
-from enum import Enum
+from enum import Enum, IntEnum
 from .exceptions import InvalidColorValueError
-import uuid
+import re
+import secrets
 
 from . import validate_node, validate_edge
+from .validate import _skip_validation
 
 
-class ColorPreset(Enum):
+# The enums mix in their value type (str/int), so members are real str/int instances: the stdlib JSON encoder writes them natively without calling `default`, and they compare equal to their raw values.
+# They are deliberately kept as Python enums rather than compiled (e.g. Cython `cpdef enum`) ones: C enums are bare ints, which would change `.value`, the JSON output and `isinstance` checks for callers. The hot paths never go through `Enum.__call__` anyway: coercion is a dict lookup in the `_value2member_map_` tables below, and comparisons are `is` checks or str equality.
+class ColorPreset(IntEnum):
     RED = 1
     ORANGE = 2
     YELLOW = 3
@@ -72,71 +113,135 @@ class ColorPreset(Enum):
     PURPLE = 6
 
 
-class PresetOrHex(Enum):
+class PresetOrHex(IntEnum):
     PRESET = 1
     HEX = 2
 
 
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
 def validate_hex_code(hexcode):
-    return len(hexcode) == 6 and all(
-        c.isdigit() or c.lower() in "abcdef" for c in hexcode
-    )
+    ## one C-level set check (faster than a compiled regex here). Not `int(hexcode, 16)`: it also accepts "0x12ab", "12_abc", " +12ab" and the like
+    return len(hexcode) == 6 and _HEX_DIGITS.issuperset(hexcode)
+
+
+_PRESET_RE = re.compile(r"0*[1-6]")  # one of the integer values of the ColorPreset enum
+
+## color string -> its Color; canvases reuse a small palette, so each distinct color is validated and allocated only once
+_COLOR_CACHE: Dict[str, "Color"] = {}
 
 
 class Color:
-    def __init__(self, color: str):
+    """ an immutable, interned color value: `Color(c) is Color(c)` for a given valid color string c. """
+    __slots__ = ("color", "preset_or_hex")
+
+    def __new__(cls, color: str):
+        cached = _COLOR_CACHE.get(color)
+        if cached is not None and type(cached) is cls:
+            return cached
         if color.startswith("#"):
             if not validate_hex_code(color[1:]):
                 raise InvalidColorValueError("Invalid hex code.")
-        # check if the color is one of the integer values of the ColorPreset enum
+            preset_or_hex = PresetOrHex.HEX
+        elif _PRESET_RE.fullmatch(color) is not None:
+            preset_or_hex = PresetOrHex.PRESET
         elif color.isdigit():
-            if int(color) not in [color.value for color in ColorPreset]:
-                raise InvalidColorValueError("Invalid color preset.")
+            raise InvalidColorValueError("Invalid color preset.")
         else:
             raise InvalidColorValueError("Invalid color value.")
-        self.color = color
-        self.preset_or_hex = PresetOrHex.PRESET if color.isdigit() else PresetOrHex.HEX
+        self = object.__new__(cls)
+        object.__setattr__(self, "color", color)
+        object.__setattr__(self, "preset_or_hex", preset_or_hex)
+        if cls is Color:
+            _COLOR_CACHE[color] = self
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Color instances are immutable (they are shared between nodes and edges).")
 
+    def __reduce__(self):
+        # re-created through __new__, so copies and unpickled colors are the interned instance too
+        return (type(self), (self.color,))
 
-class NodeType(Enum):
+
+class NodeType(str, Enum):
     TEXT = "text"
     FILE = "file"
     LINK = "link"
     GROUP = "group"
 
 
-class EdgesFromSideValue(Enum):
+class EdgesFromSideValue(str, Enum):
     TOP = "top"
     RIGHT = "right"
     BOTTOM = "bottom"
     LEFT = "left"
 
 
-class EdgesFromEndValue(Enum):
+class EdgesFromEndValue(str, Enum):
     NONE = "none"
     ARROW = "arrow"
 
 
-class EdgesToSideValue(Enum):
+class EdgesToSideValue(str, Enum):
     TOP = "top"
     RIGHT = "right"
     BOTTOM = "bottom"
     LEFT = "left"
 
 
-class EdgesToEndValue(Enum):
+class EdgesToEndValue(str, Enum):
     NONE = "none"
     ARROW = "arrow"
 
 
-class GroupNodeBackgroundStyle(Enum):
+class GroupNodeBackgroundStyle(str, Enum):
     COVER = "cover"
     RATIO = "ratio"
     REPEAT = "repeat"
 
 
+def _new_id() -> str:
+    """ default id for nodes and edges: 16 random hex characters """
+    return secrets.token_hex(8)
+
+
+## value -> member tables (the ones Enum itself maintains), so string coercion is a plain dict lookup instead of `Enum.__call__`
+_EDGE_FROM_SIDE = EdgesFromSideValue._value2member_map_
+_EDGE_FROM_END = EdgesFromEndValue._value2member_map_
+_EDGE_TO_SIDE = EdgesToSideValue._value2member_map_
+_EDGE_TO_END = EdgesToEndValue._value2member_map_
+_GROUP_BACKGROUND_STYLE = GroupNodeBackgroundStyle._value2member_map_
+
+## (field, enum, value -> member) for each enum-valued Edge field, coerced from strings in Edge.__post_init__
+_EDGE_STR_COERCIONS = (
+    ("fromSide", EdgesFromSideValue, _EDGE_FROM_SIDE),
+    ("fromEnd", EdgesFromEndValue, _EDGE_FROM_END),
+    ("toSide", EdgesToSideValue, _EDGE_TO_SIDE),
+    ("toEnd", EdgesToEndValue, _EDGE_TO_END),
+)
+
+
+def _enum_from_value(enum_cls, value_to_member: Dict[str, Enum], value):
+    """ returns the member of enum_cls for the string value (or value unchanged if it isn't a string). Unknown values fall through to enum_cls(value) so they raise the usual ValueError.
+    """
+    if type(value) is not str:
+        return value
+    member = value_to_member.get(value)
+    if member is None:
+        return enum_cls(value)
+    return member
+
+
+class _JsonCacheSlot:
+    """ gives nodes and edges a `_json_cache` slot outside of their dataclass fields. `Canvas.to_json` keeps a (field values, serialized JSON bytes) pair there and reuses the bytes while the field values are unchanged.
+    """
+    __slots__ = ("_json_cache",)
+
+
 @version_compatible_dataclass
-class Edge:
+class Edge(_JsonCacheSlot):
     fromNode: str
     toNode: str
     fromSide: EdgesFromSideValue = None
@@ -145,20 +250,38 @@ class Edge:
     toEnd: EdgesToEndValue = None
     color: Color = None
     label: str = None
-    id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    id: str = field(default_factory=_new_id)
 
     def __post_init__(self):
-        if isinstance(self.fromSide, str):
-            self.fromSide = EdgesFromSideValue(self.fromSide)
-        if isinstance(self.fromEnd, str):
-            self.fromEnd = EdgesFromEndValue(self.fromEnd)
-        if isinstance(self.toSide, str):
-            self.toSide = EdgesToSideValue(self.toSide)
-        if isinstance(self.toEnd, str):
-            self.toEnd = EdgesToEndValue(self.toEnd)
+        for attr, enum_cls, value_to_member in _EDGE_STR_COERCIONS:
+            value = getattr(self, attr)
+            if type(value) is str:
+                member = value_to_member.get(value)
+                setattr(self, attr, member if member is not None else enum_cls(value))
         if isinstance(self.color, str):
             self.color = Color(self.color)
-        validate_edge(self)
+        if not _skip_validation.get():
+            validate_edge(self)
+
+    @classmethod
+    def _from_json_dict(cls, edge_dict: Dict[str, Any]) -> "Edge":
+        """ fast-path constructor for an edge dict parsed from canvas JSON: bypasses __init__/__post_init__, ignores unknown keys, and does NOT validate (the caller must run `validate_edge` on the result).
+        """
+        if "fromNode" not in edge_dict or "toNode" not in edge_dict:
+            return cls(**edge_dict)  # raises the usual missing-argument TypeError
+        get = edge_dict.get
+        edge = cls.__new__(cls)
+        edge.fromNode = edge_dict["fromNode"]
+        edge.toNode = edge_dict["toNode"]
+        edge.fromSide = _enum_from_value(EdgesFromSideValue, _EDGE_FROM_SIDE, get("fromSide"))
+        edge.fromEnd = _enum_from_value(EdgesFromEndValue, _EDGE_FROM_END, get("fromEnd"))
+        edge.toSide = _enum_from_value(EdgesToSideValue, _EDGE_TO_SIDE, get("toSide"))
+        edge.toEnd = _enum_from_value(EdgesToEndValue, _EDGE_TO_END, get("toEnd"))
+        color = get("color")
+        edge.color = Color(color) if isinstance(color, str) else color
+        edge.label = get("label")
+        edge.id = edge_dict["id"] if "id" in edge_dict else _new_id()
+        return edge
 
     def __eq__(self, other):
         if not isinstance(other, Edge):
@@ -180,29 +303,33 @@ class Edge:
 
 
 @version_compatible_dataclass
-class GenericNode:
+class GenericNode(_JsonCacheSlot):
     type: NodeType = field()
     x: int = field(default=0)
     y: int = field(default=0)
     width: int = field(default=400)
     height: int = field(default=100)
     color: Color = field(default=None)
-    id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
-    
-    @property
-    def x1(self) -> int:
-        """The right x-position of the node."""
-        return self.x + self.width
-
-    @property
-    def y1(self) -> int:
-        """The bottom y-position of the node."""
-        return self.y + self.height
+    id: str = field(default_factory=_new_id)
+    ## The right x-position / bottom y-position of the node. Materialized at construction (plain slot reads for the containment tests), so they are NOT updated
+    ## if x/y/width/height are assigned afterwards: treat node geometry as fixed after construction and use `dataclasses.replace(node, x=...)` to move or resize a node.
+    x1: int = field(init=False, repr=False, compare=False)
+    y1: int = field(init=False, repr=False, compare=False)
 
 
     def __post_init__(self):
         if isinstance(self.color, str):
             self.color = Color(self.color)
+        try:
+            self._update_bounds()
+        except TypeError:
+            ## non-numeric geometry: the node types report it through validate_node, and then re-run _update_bounds on the validated values
+            pass
+
+    def _update_bounds(self):
+        """ (re)computes the materialized x1/y1 from x/y/width/height. Called by GenericNode.__post_init__, and again at the end of each node type's __post_init__ once validate_node has normalized the geometry. """
+        self.x1 = self.x + self.width
+        self.y1 = self.y + self.height
 
     def __eq__(self, other):
         if not isinstance(other, GenericNode):
@@ -244,16 +371,42 @@ class TextNode(GenericNode):
     type: NodeType = field(default=NodeType.TEXT)
 
     def __post_init__(self):
-        super().__post_init__()
-        if isinstance(self.type, str):
-            self.type = NodeType("text")
-        validate_node(self)
+        GenericNode.__post_init__(self)
+        ## NodeType members are str instances too, so only coerce raw strings (a node's type is always its class's type)
+        if type(self.type) is str:
+            self.type = NodeType.TEXT
+        if not _skip_validation.get():
+            validate_node(self)
+        GenericNode._update_bounds(self)
 
     def __hash__(self):
         return hash(self.id)
     
     def to_dict(self, include_computed:bool=False) -> Dict[str, Any]:
-        return super().to_dict(include_computed=include_computed) | {"text": self.text}
+        ## full dict literals, rather than merging onto the base class's dict
+        if include_computed:
+            return {
+                "type": self.type,
+                "id": self.id,
+                "x": self.x,
+                "y": self.y,
+                "x1": self.x1,
+                "y1": self.y1,
+                "width": self.width,
+                "height": self.height,
+                "color": self.color,
+                "text": self.text,
+            }
+        return {
+            "type": self.type,
+            "id": self.id,
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+            "color": self.color,
+            "text": self.text,
+        }
 
 
 @version_compatible_dataclass(kw_only=True)
@@ -263,16 +416,42 @@ class FileNode(GenericNode):
     subpath: str = field(default=None)
 
     def __post_init__(self):
-        super().__post_init__()
-        if isinstance(self.type, str):
-            self.type = NodeType("file")
-        validate_node(self)
+        GenericNode.__post_init__(self)
+        if type(self.type) is str:
+            self.type = NodeType.FILE
+        if not _skip_validation.get():
+            validate_node(self)
+        GenericNode._update_bounds(self)
 
     def __hash__(self):
         return hash(self.id)
     
     def to_dict(self, include_computed:bool=False) -> Dict[str, Any]:
-        return super().to_dict(include_computed=include_computed) | {"file": self.file, "subpath": self.subpath}
+        if include_computed:
+            return {
+                "type": self.type,
+                "id": self.id,
+                "x": self.x,
+                "y": self.y,
+                "x1": self.x1,
+                "y1": self.y1,
+                "width": self.width,
+                "height": self.height,
+                "color": self.color,
+                "file": self.file,
+                "subpath": self.subpath,
+            }
+        return {
+            "type": self.type,
+            "id": self.id,
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+            "color": self.color,
+            "file": self.file,
+            "subpath": self.subpath,
+        }
 
 
 @version_compatible_dataclass(kw_only=True)
@@ -281,16 +460,40 @@ class LinkNode(GenericNode):
     type: NodeType = field(default=NodeType.LINK)
 
     def __post_init__(self):
-        super().__post_init__()
-        if isinstance(self.type, str):
-            self.type = NodeType("link")
-        validate_node(self)
+        GenericNode.__post_init__(self)
+        if type(self.type) is str:
+            self.type = NodeType.LINK
+        if not _skip_validation.get():
+            validate_node(self)
+        GenericNode._update_bounds(self)
 
     def __hash__(self):
         return hash(self.id)
     
     def to_dict(self, include_computed:bool=False) -> Dict[str, Any]:
-        return super().to_dict(include_computed=include_computed) | {"url": self.url}
+        if include_computed:
+            return {
+                "type": self.type,
+                "id": self.id,
+                "x": self.x,
+                "y": self.y,
+                "x1": self.x1,
+                "y1": self.y1,
+                "width": self.width,
+                "height": self.height,
+                "color": self.color,
+                "url": self.url,
+            }
+        return {
+            "type": self.type,
+            "id": self.id,
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+            "color": self.color,
+            "url": self.url,
+        }
 
 
 @version_compatible_dataclass(kw_only=True)
@@ -301,18 +504,41 @@ class GroupNode(GenericNode):
     backgroundStyle: GroupNodeBackgroundStyle = field(default=None)
 
     def __post_init__(self):
-        super().__post_init__()
-        if isinstance(self.type, str):
-            self.type = NodeType("group")
-        if isinstance(self.backgroundStyle, str):
-            self.backgroundStyle = GroupNodeBackgroundStyle(self.backgroundStyle)
-        validate_node(self)
+        GenericNode.__post_init__(self)
+        if type(self.type) is str:
+            self.type = NodeType.GROUP
+        self.backgroundStyle = _enum_from_value(GroupNodeBackgroundStyle, _GROUP_BACKGROUND_STYLE, self.backgroundStyle)
+        if not _skip_validation.get():
+            validate_node(self)
+        GenericNode._update_bounds(self)
 
     def __hash__(self):
         return hash(self.id)
     
     def to_dict(self, include_computed:bool=False) -> Dict[str, Any]:
-        return super().to_dict(include_computed=include_computed) | {
+        if include_computed:
+            return {
+                "type": self.type,
+                "id": self.id,
+                "x": self.x,
+                "y": self.y,
+                "x1": self.x1,
+                "y1": self.y1,
+                "width": self.width,
+                "height": self.height,
+                "color": self.color,
+                "label": self.label,
+                "background": self.background,
+                "backgroundStyle": self.backgroundStyle,
+            }
+        return {
+            "type": self.type,
+            "id": self.id,
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+            "color": self.color,
             "label": self.label,
             "background": self.background,
             "backgroundStyle": self.backgroundStyle,
@@ -322,30 +548,20 @@ class GroupNode(GenericNode):
     def does_contain(self, putative_child_node: GenericNode) -> bool:
         """ returns True IFF the putative_child_node is completely contained within this GroupNode's bounds. 
         """
-        if (self.id == putative_child_node.id):
-            return False ## definitionally, a node will not contain itself
-    
-        if (putative_child_node.x < self.x):
-            return False ## child's left edge is outside to the left
-        elif (putative_child_node.x1 > self.x1):
-            return False ## child's right edge is outside to the right
-        elif (putative_child_node.y < self.y):
-            return False ## child's bottom edge is outside below
-        elif (putative_child_node.y1 > self.y1):
-            return False ## child's top-edge is outside above
-        else:
-            return True
+        return (
+            (self.id != putative_child_node.id) ## definitionally, a node will not contain itself
+            and (putative_child_node.x >= self.x) ## child's left edge is not outside to the left
+            and (putative_child_node.y >= self.y) ## child's bottom edge is not outside below
+            and (putative_child_node.x1 <= self.x1) ## child's right edge is not outside to the right
+            and (putative_child_node.y1 <= self.y1) ## child's top-edge is not outside above
+        )
         
 
     def find_children(self, putative_child_nodes: List[GenericNode]) -> List[GenericNode]:
         """ for the list of potentially contained nodes, returns the filtered list of only those nodes completely contained within this GroupNode's bounds (e.g. children). 
         """
-        found_children_list = []
-        for a_putative_child in putative_child_nodes:
-            if self.does_contain(putative_child_node=a_putative_child):
-                found_children_list.append(a_putative_child)
-                
-        return found_children_list
+        does_contain = self.does_contain
+        return [a_putative_child for a_putative_child in putative_child_nodes if does_contain(a_putative_child)]
 
 
     # def find_children_recurrsively(self, putative_child_nodes: List[GenericNode]) -> List[Union[GenericNode, Dict[GroupNode, Dict[GroupNode, GenericNode]]]]:
@@ -0,0 +1,75 @@
+# utils.py
+from typing import Any, List, Optional
+
+## numpy (vectorized spatial queries) and numba (compiled containment loop) are optional and slow to import,
+## so they are only imported the first time a spatial query needs them; _UNLOADED marks "not tried yet", None "not installed".
+_UNLOADED = object()
+_np = _UNLOADED
+_contained_mask_kernel = _UNLOADED
+
+## Opt-in: compile the containment test with numba (if installed). Off by default: the numpy mask is already a small part of a
+## `Canvas.find_children` query, while importing numba and loading the kernel adds a few hundred ms to the first query.
+USE_NUMBA = False
+
+
+def get_numpy() -> Optional[Any]:
+    """ returns the numpy module, or None if numpy isn't installed. Imported on the first call.
+    """
+    global _np
+    if _np is _UNLOADED:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _np = numpy
+    return _np
+
+
+def _contained_mask_loop(bounds, x, y, x1, y1, out):
+    for i in range(bounds.shape[0]):
+        out[i] = (bounds[i, 0] >= x) & (bounds[i, 1] >= y) & (bounds[i, 2] <= x1) & (bounds[i, 3] <= y1)
+
+
+def _get_contained_mask_kernel():
+    """ returns `_contained_mask_loop` compiled with numba, or None if `USE_NUMBA` is off or numba isn't installed. Compiled on the first call.
+    """
+    global _contained_mask_kernel
+    if not USE_NUMBA:
+        return None
+    if _contained_mask_kernel is _UNLOADED:
+        try:
+            from numba import njit
+        except ImportError:
+            _contained_mask_kernel = None
+        else:
+            ## serial on purpose: for canvas-sized inputs the thread start-up of parallel=True/prange costs more than the (auto-vectorized) loop itself
+            _contained_mask_kernel = njit(cache=True)(_contained_mask_loop)
+    return _contained_mask_kernel
+
+
+def node_bounds_array(nodes: List[Any]) -> "np.ndarray":
+    """ returns an (N, 4) int64 array with the (x, y, x1, y1) bounds of each node, in the order of `nodes`: one row per node (row-major, so each bounds column `bounds[:, k]` is a strided view). Requires numpy (see `get_numpy`).
+    """
+    np = get_numpy()
+    bounds = np.fromiter(
+        (v for node in nodes for v in (node.x, node.y, node.x1, node.y1)),
+        dtype=np.int64,
+        count=4 * len(nodes),
+    )
+    return bounds.reshape(-1, 4)
+
+
+def contained_mask(bounds: "np.ndarray", x: int, y: int, x1: int, y1: int) -> "np.ndarray":
+    """ returns a boolean mask of the rows of `bounds` (see `node_bounds_array`) lying completely within the (x, y, x1, y1) rectangle.
+    """
+    kernel = _get_contained_mask_kernel()
+    if kernel is not None:
+        out = get_numpy().empty(bounds.shape[0], dtype=bool)
+        kernel(bounds, x, y, x1, y1, out)
+        return out
+    return (
+        (bounds[:, 0] >= x)
+        & (bounds[:, 1] >= y)
+        & (bounds[:, 2] <= x1)
+        & (bounds[:, 3] <= y1)
+    )
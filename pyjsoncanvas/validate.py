@@ -1,5 +1,23 @@
 # validate.py
 import numbers
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+## set by `bulk_load`: when True, nodes and edges skip validate_node/validate_edge while being constructed
+_skip_validation: ContextVar[bool] = ContextVar("pyjsoncanvas_skip_validation", default=False)
+
+
+@contextmanager
+def bulk_load():
+    """Skip per-object validation while constructing nodes and edges (including in `Canvas.from_json`), for loading trusted data, e.g. canvases this library wrote itself.
+    Nothing is validated inside the block (nor are integral coordinates normalized to int); call `Canvas.validate()` afterwards if needed.
+    """
+    token = _skip_validation.set(True)
+    try:
+        yield
+    finally:
+        _skip_validation.reset(token)
+
 
 # second param for no exceptions only return bool
 def validate_node(node) -> bool:
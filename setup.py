@@ -5,6 +5,9 @@ from setuptools import setup
 # Add Python version check
 PY_310_OR_HIGHER = sys.version_info >= (3, 10)
 
+with open("README.md", encoding="utf-8") as f:
+    long_description = f.read()
+
 setup(
     name="PyJSONCanvas",
     version="1.0.2",
@@ -13,9 +16,10 @@ setup(
     url="https://github.com/CommanderPho/PyJSONCanvas.git",
     license="MIT",
     py_modules=["pyjsoncanvas"],
-    long_description=open("README.md").read(),
+    long_description=long_description,
     long_description_content_type="text/markdown",
     python_requires=">=3.9",  # Specify minimum Python version
+    extras_require={"fast": ["orjson", "pysimdjson", "numpy"]},
     # Add classifiers to indicate supported Python versions
     classifiers=[
         "Programming Language :: Python :: 3.9",